@@ -1,56 +1,199 @@
-# law.py (수정본 - 게시 날짜 확인 기능 추가 및 Gemini 2.5 Pro 사용)
+# law.py (수정본 - 게시 날짜 확인 기능 추가 및 Gemini 2.5 Flash 사용)
 
 import os
+import asyncio
+import atexit
 import time
 import glob
 import re
+import hashlib
+import mmap
+import queue
+import threading
 import traceback # 오류 추적용
-
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from urllib.parse import urljoin, urlparse, unquote
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait as wait_futures
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
 
-import PyPDF2 # PDF 처리를 위한 라이브러리
-import google.generativeai as genai # Gemini API 라이브러리
+# 무거운 외부 라이브러리(selenium, webdriver_manager, requests/lxml, fitz, google.genai,
+# tenacity)는 사용하는 함수 안에서 import 합니다. 캐시 적중 등으로 일찍 끝나는 실행은
+# 이 모듈들의 로딩 비용을 치르지 않습니다.
+
+try:
+    # 다운로드 완료 감지용 파일 시스템 이벤트 감시 (Linux에서는 inotify 사용)
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # watchdog 미설치 시 기존 폴링 방식으로 대체
+    Observer = None
+    FileSystemEventHandler = object
 
 # --- 설정 ---
 # 대상 URL
 URL = "https://www.nars.go.kr/report/list.do?cmsCode=CM0043"
 # 다운로드 폴더 설정 (GitHub Actions 환경 고려)
 DOWNLOAD_DIR = os.path.join(os.getcwd(), "downloads")
+# PDF 내용 해시 기반 캐시 폴더 (추출 텍스트 / 생성된 글 재사용)
+CACHE_DIR = os.path.join(DOWNLOAD_DIR, ".cache")
 # 저장될 게시물 폴더 (Handmade Blog 템플릿 기준)
 POSTS_DIR = "_articles"
+# HTTP 요청 타임아웃 (초)
+HTTP_TIMEOUT = 15
+# 최신 보고서의 [다운로드] 링크 XPath (브라우저 대체 경로에서 클릭)
+DOWNLOAD_LINK_XPATH = '//a[contains(normalize-space(.), "[다운로드]")]'
+# 목록 페이지 HTML에서 같은 [다운로드] 링크의 주소를 찾는 XPath (HTTP 경로)
+PDF_LINK_XPATH = DOWNLOAD_LINK_XPATH + '/@href'
+# 미리 설치된 ChromeDriver 경로 (존재하면 WebDriver Manager의 네트워크 확인 생략)
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER", "/usr/local/bin/chromedriver")
+# WebDriver Manager가 내려받은 드라이버 캐시 위치 (WDM_LOCAL=1이면 현재 폴더의 .wdm 사용)
+WDM_CACHE_DIRS = (os.path.join(os.getcwd(), ".wdm"), os.path.join(os.path.expanduser("~"), ".wdm"))
+# 공유 드라이버의 Chrome 프로필 폴더 (실행 간 HTTP/DNS 캐시 재사용, CI에서는 actions/cache로 보존)
+# BrowserPool은 캐시를 쓰지 않는 격리 컨텍스트에서 탐색하므로 프로필을 사용하지 않음
+CHROME_PROFILE_DIR = os.path.join(os.getcwd(), ".chrome-profile")
+# 브라우저 풀에서 드라이버 하나가 만들 최대 컨텍스트 수 (초과 시 Chrome 재시작으로 메모리 회수)
+BROWSER_POOL_MAX_CONTEXTS = 20
 # 다운로드 대기 최대 시간 (초)
 DOWNLOAD_WAIT_TIMEOUT = 120 # 2분
+# 다운로드 완료 폴링 시작 간격 / 최대 간격 (초, watchdog 미설치 시)
+DOWNLOAD_POLL_INTERVAL = 0.1
+DOWNLOAD_POLL_MAX_INTERVAL = 1.0
+# [다운로드] 링크 대기 시간 / 확인 간격 (초)
+LINK_WAIT_TIMEOUT = 10
+LINK_POLL_INTERVAL = 0.1
+# PDF 페이지 병렬 추출 최대 프로세스 수
+EXTRACT_MAX_WORKERS = 8
+# PDF에서 추출할 최대 글자 수 (본문 요약에 충분한 분량, 초과 시 이후 페이지 생략)
+# Gemini 요청 크기와 분당 토큰 사용량을 줄이기 위해 Gemini에 보낼 때도 같은 상한을 적용
+PDF_TEXT_MAX_CHARS = 80000
+# 부록/참고문헌 제목 검사를 시작할 페이지 (0부터, 표지/목차의 '부록' 항목 오인 방지)
+APPENDIX_SCAN_START_PAGE = 3
 # Gemini API 키 (환경 변수에서 읽기)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# 사용할 Gemini 모델 (Flash: Pro 대비 빠르고 요청 한도 여유가 큼)
+GEMINI_MODEL_NAME = 'gemini-2.5-flash'
+# Gemini 요청 한도 초과(429) 시 최대 시도 횟수
+GEMINI_MAX_ATTEMPTS = 5
+# Gemini 분당 토큰 한도 (이 값을 넘기 전에 스스로 대기)
+GEMINI_TOKENS_PER_MINUTE = 4000000
+# Gemini Batch API 작업 상태 확인 간격 (초)
+GEMINI_BATCH_POLL_INTERVAL = 30
+# Gemini Batch API 작업 최대 대기 시간 (초, GitHub Actions 잡 시간 제한보다 충분히 짧게)
+# 초과 시 작업을 취소하고 보고서별 동기 호출로 대체
+GEMINI_BATCH_TIMEOUT = 30 * 60
+# Gemini Batch API 작업 종료 상태
+GEMINI_BATCH_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED",
+    "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED",
+}
+# Gemini 출력 토큰 상한 (gemini-2.5-flash는 생각(thinking) 토큰도 이 상한에 포함되므로 여유 있게 설정)
+GEMINI_MAX_OUTPUT_TOKENS = 16384
+
+# 미리 컴파일한 정규식 (Gemini 응답 정리 / 부록 페이지 감지)
+_MD_FENCE_OPEN = re.compile(r'^```markdown\s*', re.IGNORECASE) # 응답 앞 코드 블록 마커
+_MD_FENCE_CLOSE = re.compile(r'\s*```$') # 응답 끝 코드 블록 마커
+_APPENDIX_HEADING = re.compile(r'^[ \t]*(참고문헌|부록|References)[ \t]*$', re.MULTILINE) # 부록/참고문헌 제목 줄
+_BLANK_LINES = re.compile(r'\n{3,}') # 연속된 빈 줄 (정렬 추출 결과 정리용)
 
 # --- 함수 정의 ---
 
-def setup_driver(download_dir):
-    """Headless Chrome 드라이버를 설정하고 다운로드 폴더를 지정합니다."""
+def _is_executable(path):
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+# 찾아 둔 드라이버가 설치된 Chrome과 버전이 맞지 않아 WebDriver Manager 설치로 전환했는지 여부
+_chromedriver_needs_install = False
+
+@lru_cache(maxsize=2)
+def _chromedriver_path(install=False):
+    """사용할 ChromeDriver 경로를 찾습니다 (프로세스당 한 번만 확인).
+
+    미리 설치된 드라이버 → WebDriver Manager 캐시(.wdm)에 남아 있는 드라이버 순으로 찾고,
+    둘 다 없거나 install=True이면 ChromeDriverManager().install()로 버전 확인 및 다운로드를 합니다.
+    """
+    if install:
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    if _is_executable(CHROMEDRIVER_PATH):
+        print(f"설치된 ChromeDriver 사용: {CHROMEDRIVER_PATH}")
+        return CHROMEDRIVER_PATH
+    cached = [
+        path
+        for cache_dir in WDM_CACHE_DIRS
+        for path in glob.glob(os.path.join(cache_dir, "drivers", "chromedriver", "**", "chromedriver"), recursive=True)
+        if _is_executable(path)
+    ]
+    if cached:
+        path = max(cached, key=os.path.getmtime) # 가장 최근에 받은 드라이버
+        print(f"캐시된 ChromeDriver 사용: {path}")
+        return path
+    # 설치된 드라이버가 없을 때만 WebDriver Manager로 자동 설치 및 경로 설정
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+def _prepare_chrome_profile(profile_dir):
+    """프로필 폴더를 만들고, 이전 실행(다른 Runner 포함)이 남긴 Singleton 잠금 파일을 지웁니다.
+
+    프로필 하나는 Chrome 하나만 사용하므로 남아 있는 잠금은 모두 비정상 종료의 흔적입니다.
+    """
+    os.makedirs(profile_dir, exist_ok=True)
+    for name in ("SingletonLock", "SingletonSocket", "SingletonCookie"):
+        lock_path = os.path.join(profile_dir, name)
+        if os.path.lexists(lock_path):
+            os.remove(lock_path)
+
+def setup_driver(download_dir, profile_dir=None):
+    """Headless Chrome 드라이버를 설정하고 다운로드 폴더를 지정합니다.
+
+    profile_dir가 주어지면 그 프로필을 재사용하므로 동시에 띄우는 Chrome마다 다른 폴더를 넘겨야 합니다.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from selenium.common.exceptions import SessionNotCreatedException
+
     chrome_options = Options()
     chrome_options.add_argument("--headless")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--window-size=1920x1080")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false") # 이미지 로딩 차단
+    if profile_dir:
+        _prepare_chrome_profile(profile_dir)
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+    # DOMContentLoaded 시점에 driver.get()이 반환되도록 설정 (필요한 것은 링크 하나뿐)
+    chrome_options.page_load_strategy = "eager"
     prefs = {
         "download.default_directory": download_dir,
         "download.prompt_for_download": False,
         "download.directory_upgrade": True,
-        "plugins.always_open_pdf_externally": True  # PDF 뷰어 대신 바로 다운로드
+        "plugins.always_open_pdf_externally": True,  # PDF 뷰어 대신 바로 다운로드
+        "profile.managed_default_content_settings.images": 2, # 이미지 차단
+        "profile.default_content_setting_values.notifications": 2, # 알림 차단
+        "profile.managed_default_content_settings.stylesheets": 2, # CSS 차단 (링크 클릭에는 불필요)
+        "profile.managed_default_content_settings.fonts": 2, # 웹 폰트 차단
     }
     chrome_options.add_experimental_option("prefs", prefs)
+    global _chromedriver_needs_install
     try:
-        # WebDriver Manager를 사용하여 ChromeDriver 자동 설치 및 경로 설정
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        try:
+            service = Service(executable_path=_chromedriver_path(install=_chromedriver_needs_install))
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+        except SessionNotCreatedException as e:
+            if _chromedriver_needs_install:
+                raise
+            # Chrome 자동 업데이트 등으로 찾아 둔 드라이버와 버전이 맞지 않는 경우, 한 번만 새로 설치해 재시도
+            print(f"ChromeDriver로 세션을 만들지 못해 WebDriver Manager로 다시 설치합니다: {e.msg}")
+            _chromedriver_path.cache_clear()
+            _chromedriver_needs_install = True
+            service = Service(executable_path=_chromedriver_path(install=True))
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+        # Headless 모드에서도 지정 폴더로 다운로드되도록 CDP로 다운로드 동작 설정
+        driver.execute_cdp_cmd("Page.setDownloadBehavior", {"behavior": "allow", "downloadPath": download_dir})
         print(f"Chrome 드라이버 (Headless) 설정 완료. 다운로드 폴더: {download_dir}")
         return driver
     except ValueError as e:
@@ -59,94 +202,837 @@ def setup_driver(download_dir):
         print("시스템에 Chrome이 설치되어 있는지 확인하거나, GitHub Actions 환경의 Runner 구성을 확인하세요.")
         raise
 
+# download_latest_report의 Selenium 대체 경로가 재사용하는 드라이버 (첫 사용 시 생성)
+_shared_driver = None
+
+def _quit_shared_driver():
+    global _shared_driver
+    if _shared_driver is not None:
+        try:
+            _shared_driver.quit()
+        except Exception:
+            pass # 종료 시점이므로 정리 실패는 무시
+        _shared_driver = None
+
+atexit.register(_quit_shared_driver)
+
+def get_shared_driver(download_dir=DOWNLOAD_DIR):
+    """프로세스 안에서 재사용하는 Chrome 드라이버를 반환합니다 (종료 시 atexit로 quit).
+
+    다시 사용할 때는 쿠키를 지우고 다운로드 폴더를 새로 지정하며,
+    드라이버가 응답하지 않으면 새로 띄웁니다.
+    """
+    from selenium.common.exceptions import WebDriverException
+
+    global _shared_driver
+    if _shared_driver is not None:
+        try:
+            _shared_driver.delete_all_cookies()
+            _shared_driver.execute_cdp_cmd("Page.setDownloadBehavior", {"behavior": "allow", "downloadPath": download_dir})
+            return _shared_driver
+        except WebDriverException as e:
+            print(f"공유 드라이버 재사용 실패, 새로 띄웁니다: {e}")
+            _quit_shared_driver()
+    # 공유 드라이버는 기본 컨텍스트에서 탐색하므로 영구 프로필의 캐시를 활용
+    _shared_driver = setup_driver(download_dir, CHROME_PROFILE_DIR)
+    return _shared_driver
+
+class _PooledBrowser:
+    """BrowserPool이 관리하는 Chrome 인스턴스 하나와 사용 기록."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.home_handle = driver.current_window_handle # 컨텍스트 반납 후 돌아갈 기본 창
+        self.contexts_used = 0
+
+class BrowserPool:
+    """headless Chrome을 미리 띄워 두고 CDP 브라우저 컨텍스트(시크릿 창과 같은 격리)를 빌려줍니다.
+
+    여러 보고서를 처리할 때 보고서마다 Chrome을 새로 띄우는 비용을 없앱니다.
+    드라이버 하나가 max_contexts개의 컨텍스트를 만들면 네이티브 메모리 누적을 막기 위해 재시작합니다.
+
+        with BrowserPool() as pool:
+            with pool.acquire() as driver:
+                driver.get(URL)
+    """
+
+    def __init__(self, size=1, download_dir=DOWNLOAD_DIR, max_contexts=BROWSER_POOL_MAX_CONTEXTS):
+        self.download_dir = download_dir
+        self.max_contexts = max_contexts
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(_PooledBrowser(setup_driver(download_dir)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @contextmanager
+    def acquire(self, download_dir=None):
+        """새 브라우저 컨텍스트의 탭으로 전환된 드라이버를 빌려주고, 끝나면 컨텍스트를 폐기합니다."""
+        download_dir = download_dir or self.download_dir
+        browser = self._idle.get()
+        driver = browser.driver
+        context_id = None
+        try:
+            context_id = driver.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+            handles_before = set(driver.window_handles)
+            driver.execute_cdp_cmd("Target.createTarget", {"url": "about:blank", "browserContextId": context_id})
+            driver.switch_to.window((set(driver.window_handles) - handles_before).pop())
+            # 컨텍스트마다 다운로드 폴더를 따로 지정
+            driver.execute_cdp_cmd("Browser.setDownloadBehavior", {
+                "behavior": "allow",
+                "downloadPath": download_dir,
+                "browserContextId": context_id,
+            })
+            yield driver
+        finally:
+            browser = self._release(browser, context_id)
+            self._idle.put(browser)
+
+    def _release(self, browser, context_id):
+        """컨텍스트를 폐기하고, 사용 횟수가 상한에 도달했거나 드라이버가 망가졌으면 Chrome을 새로 띄웁니다."""
+        from selenium.common.exceptions import WebDriverException
+
+        browser.contexts_used += 1
+        try:
+            if context_id:
+                # 컨텍스트 폐기 시 그 안의 탭도 함께 닫힘
+                browser.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context_id})
+            browser.driver.switch_to.window(browser.home_handle)
+            healthy = True
+        except WebDriverException as e:
+            print(f"브라우저 컨텍스트 정리 중 오류, 드라이버를 재시작합니다: {e}")
+            healthy = False
+        if healthy and browser.contexts_used < self.max_contexts:
+            return browser
+        try:
+            browser.driver.quit()
+        except WebDriverException:
+            pass
+        print("브라우저 풀: Chrome 드라이버 재시작")
+        return _PooledBrowser(setup_driver(self.download_dir))
+
+    def close(self):
+        """풀의 모든 Chrome 인스턴스를 종료합니다."""
+        from selenium.common.exceptions import WebDriverException
+
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                browser.driver.quit()
+            except WebDriverException:
+                pass
+
+class _PdfDownloadHandler(FileSystemEventHandler):
+    """.pdf 파일의 생성/쓰기/닫기 및 .crdownload → .pdf 이름 변경 이벤트를 큐로 전달합니다.
+
+    완료 여부 판단은 큐를 기다리는 쪽(wait_for_download_complete)에서 합니다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.events = queue.Queue()
+
+    def _push(self, path, final):
+        # final: 쓰기가 끝났음이 보장된 이벤트(닫기/이름 변경)인지 여부
+        if path.lower().endswith(".pdf"):
+            self.events.put((path, final))
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._push(event.src_path, False)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._push(event.src_path, False)
+
+    def on_closed(self, event): # inotify IN_CLOSE_WRITE (Linux)
+        if not event.is_directory:
+            self._push(event.src_path, True)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._push(event.dest_path, True)
+
+def _is_download_finished(download_dir, pdf_path, final):
+    """진행 중인 .crdownload가 없고 PDF 크기가 0이 아니면 완료로 판단합니다.
+
+    닫기/이름 변경 이벤트가 아니면 잠시 뒤 크기와 수정 시각이 그대로인지 한 번 더 확인합니다.
+    """
+    if glob.glob(os.path.join(download_dir, "*.crdownload")):
+        return False
+    try:
+        stat = os.stat(pdf_path)
+        if stat.st_size == 0: # Chrome이 다운로드 시작 시 만드는 0바이트 자리표시 파일 제외
+            return False
+        if final:
+            return True
+        time.sleep(DOWNLOAD_POLL_MAX_INTERVAL) # 최종 크기/수정 시각 한 번 확인
+        latest = os.stat(pdf_path)
+        return (latest.st_size, latest.st_mtime) == (stat.st_size, stat.st_mtime)
+    except OSError:
+        return False
+
 def wait_for_download_complete(download_dir, timeout):
-    """지정된 폴더에 PDF 파일 다운로드가 완료될 때까지 대기합니다."""
+    """지정된 폴더에 PDF 파일 다운로드가 완료될 때까지 대기합니다.
+
+    watchdog이 설치되어 있으면 파일 시스템 이벤트가 올 때만 확인하고,
+    없으면 폴링 방식(_poll_for_download_complete)으로 대체합니다.
+    """
+    if Observer is None:
+        return _poll_for_download_complete(download_dir, timeout)
+
+    print(f"'{download_dir}' 폴더의 PDF 다운로드 완료 이벤트를 대기합니다 (최대 {timeout}초)...")
+    deadline = time.time() + timeout
+    os.makedirs(download_dir, exist_ok=True)
+    handler = _PdfDownloadHandler()
+    observer = Observer()
+    observer.schedule(handler, download_dir, recursive=False)
+    observer.start()
+    try:
+        # 감시 시작 전에 이미 다운로드가 끝난 경우 처리
+        completed = _find_completed_pdf(download_dir)
+        if completed and completed[1] > 0:
+            print(f"다운로드 완료 확인: {os.path.basename(completed[0])}")
+            return completed[0]
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                pdf_path, final = handler.events.get(timeout=remaining)
+            except queue.Empty:
+                break
+            # 쌓여 있는 쓰기 이벤트는 한 번에 모아서 확인
+            while not handler.events.empty():
+                next_path, next_final = handler.events.get_nowait()
+                if next_final or next_path != pdf_path:
+                    pdf_path, final = next_path, next_final
+            if _is_download_finished(download_dir, pdf_path, final):
+                print(f"다운로드 완료 확인: {os.path.basename(pdf_path)}")
+                return pdf_path
+        from selenium.common.exceptions import TimeoutException
+        raise TimeoutException(f"다운로드 시간 초과({timeout}초) 또는 PDF 파일을 찾을 수 없습니다.")
+    finally:
+        observer.stop()
+        observer.join()
+
+def _find_completed_pdf(download_dir):
+    """진행 중인 .crdownload 파일이 없으면 가장 최근 PDF의 (경로, 크기, 수정 시각)을, 없으면 None을 반환합니다.
+
+    폴더는 os.scandir로 한 번만 훑고, DirEntry가 캐시하는 stat 한 번으로 크기와 수정 시각을 함께 얻습니다.
+    """
+    latest = None
+    latest_mtime = -1.0
+    with os.scandir(download_dir) as entries:
+        for entry in entries:
+            name = entry.name.lower()
+            if name.endswith(".crdownload"):
+                return None # 아직 다운로드 중
+            if name.endswith(".pdf") and entry.is_file():
+                # 가장 최근에 수정된 파일 선택 (새로 다운로드된 파일일 가능성 높음)
+                stat = entry.stat()
+                if stat.st_mtime > latest_mtime:
+                    latest_mtime = stat.st_mtime
+                    latest = (entry.path, stat.st_size, stat.st_mtime)
+    return latest
+
+def _poll_for_download_complete(download_dir, timeout):
+    """폴더를 주기적으로 확인하여 PDF 파일 다운로드 완료를 대기합니다 (watchdog 미설치 시).
+
+    연속된 두 번의 확인에서 같은 PDF의 크기가 0이 아니고 크기와 수정 시각이 변하지 않았으면 완료로 봅니다.
+    확인 간격은 DOWNLOAD_POLL_INTERVAL에서 시작해, 10번 연속 미완료마다 1.5배씩
+    DOWNLOAD_POLL_MAX_INTERVAL까지 늘립니다.
+    """
     print(f"'{download_dir}' 폴더에서 PDF 다운로드 완료를 대기합니다 (최대 {timeout}초)...")
-    start_time = time.time()
-    downloaded_pdf_path = None
-
-    while time.time() - start_time < timeout:
-        # 다운로드 중인 임시 파일(.crdownload) 확인
-        crdownload_files = glob.glob(os.path.join(download_dir, "*.crdownload"))
-        if crdownload_files:
-            print(f"다운로드 중 파일 감지: {crdownload_files}, 1초 대기...")
-            time.sleep(1)
-            continue # 아직 다운로드 중이므로 다시 확인
-
-        # PDF 파일 확인
-        pdf_files = glob.glob(os.path.join(download_dir, "*.pdf"))
-        if pdf_files:
-            # 가장 최근에 수정된 파일 선택 (새로 다운로드된 파일일 가능성 높음)
-            latest_file = max(pdf_files, key=os.path.getmtime)
+    deadline = time.time() + timeout
+    poll_interval = DOWNLOAD_POLL_INTERVAL
+    misses = 0
+    previous = None # 직전 확인 결과 (경로, 크기, 수정 시각)
+    while time.time() < deadline:
+        try:
+            current = _find_completed_pdf(download_dir)
+        except FileNotFoundError:
+            # 폴더가 아직 없거나 확인 도중 파일이 사라진 경우 (예: 이름 변경 중) 다음 확인에서 다시 시도
+            current = None
+        if current and current[1] > 0 and current == previous:
+            print(f"다운로드 완료 확인: {os.path.basename(current[0])}")
+            return current[0]
+        previous = current
+        misses += 1
+        if misses % 10 == 0:
+            poll_interval = min(poll_interval * 1.5, DOWNLOAD_POLL_MAX_INTERVAL)
+        time.sleep(poll_interval)
+
+    # 지정된 시간 내에 다운로드가 완료되지 않음
+    from selenium.common.exceptions import TimeoutException
+    raise TimeoutException(f"다운로드 시간 초과({timeout}초) 또는 PDF 파일을 찾을 수 없습니다.")
+
+def find_report_pdf_url(list_url):
+    """보고서 목록 페이지 HTML에서 첫 번째 [다운로드] 링크의 절대 URL을 찾습니다. 없으면 None을 반환합니다.
+
+    javascript: 등 HTTP 주소가 아닌 링크는 건너뜁니다.
+    """
+    import requests
+    import lxml.html
+
+    print(f"보고서 목록 페이지 요청: {list_url}")
+    response = requests.get(list_url, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    # 링크를 "[다운로드]" 글자로 찾으므로 문자 인코딩이 맞아야 함:
+    # 응답 헤더에 charset이 있으면 그것을, 없으면 lxml이 HTML의 meta charset을 감지하여 사용
+    parser = None
+    if "charset" in response.headers.get("Content-Type", "").lower():
+        parser = lxml.html.HTMLParser(encoding=response.encoding)
+    for href in lxml.html.fromstring(response.content, parser=parser).xpath(PDF_LINK_XPATH):
+        pdf_url = urljoin(list_url, href.strip())
+        if urlparse(pdf_url).scheme in ("http", "https"):
+            print(f"PDF 링크 발견: {pdf_url}")
+            return pdf_url
+    print("목록 페이지에서 PDF 다운로드 링크를 찾지 못했습니다.")
+    return None
+
+# PDF 보관, 블로그 글 저장 등 다른 작업과 겹쳐 실행할 디스크 작업을 처리하는 스레드
+# (인터프리터 종료 시 남은 작업이 끝날 때까지 기다림)
+_io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="law-io")
+
+def _pdf_filename(pdf_url):
+    """PDF URL에서 저장할 파일 이름을 정합니다 (.pdf 확장자 보장)."""
+    filename = os.path.basename(unquote(urlparse(pdf_url).path)) or "report.pdf"
+    if not filename.lower().endswith(".pdf"):
+        filename += ".pdf"
+    return filename
+
+def _write_pdf_file(pdf_bytes, pdf_path):
+    """PDF 원본을 임시 이름으로 쓴 뒤 이름을 바꿔 저장합니다 (보관용, 백그라운드 스레드에서 실행)."""
+    try:
+        tmp_path = f"{pdf_path}.part" # 완료 전에는 .pdf로 보이지 않도록 임시 이름 사용
+        with open(tmp_path, 'wb') as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_path, pdf_path)
+        print(f"PDF 보관 완료: {pdf_path} ({len(pdf_bytes)} bytes)")
+    except OSError as e:
+        print(f"PDF 보관 중 오류 발생: {e}")
+
+def archive_pdf_bytes(pdf_bytes, pdf_url, download_dir):
+    """메모리로 받은 PDF를 백그라운드 스레드에서 다운로드 폴더에 보관합니다.
+
+    파이프라인은 쓰기가 끝나기를 기다리지 않고 bytes로 바로 진행합니다.
+    """
+    os.makedirs(download_dir, exist_ok=True)
+    return _io_executor.submit(_write_pdf_file, pdf_bytes, os.path.join(download_dir, _pdf_filename(pdf_url)))
+
+def _download_report_with_driver(driver, list_url, download_dir, archive=False):
+    """Selenium으로 목록 페이지의 [다운로드] 링크를 찾아 PDF를 내려받습니다 (대체 경로).
+
+    링크에 실제 URL이 있으면 브라우저 쿠키로 메모리에 직접 받아 bytes를 반환하고
+    (archive=True이면 백그라운드에서 디스크에도 보관), 아니면 클릭 후 다운로드된 파일 경로를 반환합니다.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    driver.get(list_url) # eager 로딩: DOMContentLoaded 시점에 반환
+    download_link = WebDriverWait(driver, LINK_WAIT_TIMEOUT, poll_frequency=LINK_POLL_INTERVAL).until(
+        EC.element_to_be_clickable((By.XPATH, DOWNLOAD_LINK_XPATH))
+    )
+    pdf_bytes = _download_link_via_http(driver, download_link, list_url, download_dir, archive)
+    if pdf_bytes is not None:
+        return pdf_bytes
+    driver.execute_script("arguments[0].click();", download_link)
+    return wait_for_download_complete(download_dir, DOWNLOAD_WAIT_TIMEOUT)
+
+def _session_from_driver(driver, referer):
+    """브라우저의 쿠키와 User-Agent를 그대로 쓰는 requests.Session을 만듭니다."""
+    import requests
+
+    session = requests.Session()
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie["name"], cookie["value"],
+                            domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+    session.headers.update({
+        "User-Agent": driver.execute_script("return navigator.userAgent;"),
+        "Referer": referer,
+    })
+    return session
+
+def _download_link_via_http(driver, download_link, list_url, download_dir, archive=False):
+    """[다운로드] 링크의 href가 실제 URL이면 클릭 대신 브라우저 세션으로 메모리에 직접 받아 bytes를 반환합니다.
+
+    href가 없거나(javascript: 등) 응답이 PDF가 아니면 None을 반환하여 클릭 방식으로 넘어갑니다.
+    """
+    import requests
+
+    href = download_link.get_attribute("href") # 절대 URL로 반환됨
+    if not href or urlparse(href).scheme not in ("http", "https"):
+        return None
+    try:
+        with _session_from_driver(driver, list_url) as session:
+            pdf_bytes = fetch_pdf_bytes(href, session=session)
+    except requests.RequestException as e:
+        print(f"링크 직접 다운로드 실패, 클릭으로 대체합니다: {e}")
+        return None
+    if not _is_pdf(pdf_bytes):
+        print("링크 응답이 PDF가 아니므로 클릭으로 대체합니다.")
+        return None
+    if archive:
+        archive_pdf_bytes(pdf_bytes, href, download_dir)
+    return pdf_bytes
+
+def _is_pdf(data):
+    """PDF 파일 시그니처(%PDF-)로 시작하는지 확인합니다 (오류 페이지 HTML 등 걸러내기)."""
+    return data.startswith(b"%PDF-")
+
+def fetch_pdf_bytes(pdf_url, session=None):
+    """PDF를 내려받아 디스크에 쓰지 않고 bytes로 반환합니다.
+
+    session(requests.Session)이 주어지면 그 쿠키/헤더로 요청합니다.
+    """
+    import requests
+
+    print(f"PDF 다운로드 중 (메모리): {pdf_url}")
+    response = (session or requests).get(pdf_url, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    print(f"다운로드 완료: {len(response.content)} bytes")
+    return response.content
+
+def _fetch_report_via_http(list_url, download_dir, archive):
+    """HTTP 경로로 최신 보고서를 받습니다.
+
+    요청이 실패(HTTP 오류 상태, 연결 오류, 시간 초과 등)하거나 PDF 링크가 없거나
+    응답이 PDF가 아니면 None을 반환하여 Selenium 대체 경로로 넘어가게 합니다.
+    """
+    import requests
+
+    try:
+        pdf_url = find_report_pdf_url(list_url)
+        if not pdf_url:
+            return None
+        pdf_bytes = fetch_pdf_bytes(pdf_url)
+    except requests.RequestException as e:
+        print(f"HTTP 요청 실패: {e}")
+        return None
+    if not _is_pdf(pdf_bytes):
+        print("링크 응답이 PDF가 아닙니다.")
+        return None
+    if archive:
+        archive_pdf_bytes(pdf_bytes, pdf_url, download_dir)
+    return pdf_bytes
+
+def _new_report_dir(download_dir):
+    """브라우저 다운로드 한 번에 쓸 빈 하위 폴더를 download_dir 아래에 새로 만듭니다.
+
+    다운로드 완료 확인은 폴더의 최신 PDF를 보므로, 이전 다운로드나 보관된 PDF가 있는 폴더를
+    다시 쓰면 새 파일이 생기기 전에 예전 파일을 완료로 오인할 수 있습니다.
+    """
+    import tempfile
+
+    os.makedirs(download_dir, exist_ok=True)
+    return tempfile.mkdtemp(prefix="report-", dir=download_dir)
+
+def download_latest_report(list_url=URL, download_dir=DOWNLOAD_DIR, archive=False):
+    """최신 보고서 PDF를 내려받아 PDF 원본(bytes) 또는 파일 경로를 반환합니다.
+
+    목록 페이지가 서버 렌더링 HTML이므로 requests + lxml로 링크를 찾아 바로 받고,
+    HTML에서 PDF 링크를 찾지 못한 경우에만 headless Chrome을 사용합니다.
+    HTTP로 받은 PDF는 bytes로 반환하며, archive=True일 때만 백그라운드에서 디스크에도 보관합니다.
+    """
+    pdf_source = _fetch_report_via_http(list_url, download_dir, archive)
+    if pdf_source is not None:
+        return pdf_source
+    print("HTTP 경로 실패, Selenium으로 대체합니다.")
+    # 드라이버는 다음 호출에서 재사용하고 프로세스 종료 시 정리 (다운로드 폴더는 호출마다 새로 지정)
+    report_dir = _new_report_dir(download_dir)
+    return _download_report_with_driver(get_shared_driver(report_dir), list_url, report_dir, archive)
+
+def download_latest_reports(list_urls, download_dir=DOWNLOAD_DIR, archive=False):
+    """여러 목록 페이지에서 최신 보고서 PDF를 내려받아 PDF 원본(bytes) 또는 경로 목록을 반환합니다.
+
+    Selenium이 필요한 페이지가 있으면 BrowserPool 하나를 띄워 재사용합니다.
+    브라우저로 받는 파일은 페이지마다 새 하위 폴더에 저장하여 서로(또는 이전 실행의 파일과) 섞이지 않게 합니다.
+    한 페이지의 다운로드가 실패해도 나머지는 계속 받으며, 실패한 자리에는 예외가 담깁니다.
+    """
+    pdf_sources = []
+    pool = None
+    try:
+        for list_url in list_urls:
+            pdf_source = _fetch_report_via_http(list_url, download_dir, archive)
+            if pdf_source is not None:
+                pdf_sources.append(pdf_source)
+                continue
+            print(f"HTTP 경로 실패, Selenium으로 대체합니다: {list_url}")
             try:
-                # 파일 크기 변화를 통해 다운로드 완료 여부 판단
-                current_size = os.path.getsize(latest_file)
-                print(f"PDF 파일 감지: {os.path.basename(latest_file)}, 크기: {current_size} bytes. 1초 후 크기 변화 확인...")
-                time.sleep(1) # 파일 쓰기 완료 시간 확보
-                final_size = os.path.getsize(latest_file)
-                if current_size == final_size and current_size > 0: # 크기 변화 없고, 0 바이트가 아니면 완료로 간주
-                    print(f"다운로드 완료 확인: {os.path.basename(latest_file)}")
-                    downloaded_pdf_path = latest_file
-                    break # 다운로드 완료, 반복 중단
-                else:
-                    print(f"파일 크기 변경 감지 또는 크기 0. 다운로드 진행 중...")
-            except FileNotFoundError:
-                # 파일이 갑자기 사라진 경우 (예: 사용자가 수동 삭제)
-                print(f"파일 접근 중 오류 발생 (파일이 삭제되었을 수 있음): {latest_file}, 계속 대기...")
-                time.sleep(1)
+                if pool is None:
+                    pool = BrowserPool(download_dir=download_dir)
+                report_dir = _new_report_dir(download_dir)
+                with pool.acquire(download_dir=report_dir) as driver:
+                    pdf_sources.append(_download_report_with_driver(driver, list_url, report_dir, archive))
             except Exception as e:
-                print(f"파일 크기 확인 중 예상치 못한 오류: {e}")
-                time.sleep(1)
-        else:
-            # 아직 PDF 파일이 없음
-            print("다운로드된 PDF 파일 없음, 1초 대기...")
-            time.sleep(1)
+                print(f"보고서 다운로드 실패 ({list_url}): {e}")
+                pdf_sources.append(e)
+    finally:
+        if pool is not None:
+            pool.close()
+    return pdf_sources
 
-    if downloaded_pdf_path:
-        return downloaded_pdf_path
-    else:
-        # 지정된 시간 내에 다운로드가 완료되지 않음
-        raise TimeoutException(f"다운로드 시간 초과({timeout}초) 또는 PDF 파일을 찾을 수 없습니다.")
+@contextmanager
+def _open_pdf_source(pdf_source):
+    """PDF 원본(bytes) 또는 파일 경로를 받아 (버퍼, 로그용 이름)을 제공합니다.
+
+    파일 경로는 mmap으로 매핑한 memoryview를 넘겨, 파일 내용을 파이썬 힙으로 복사하지 않고
+    OS 페이지 캐시에서 바로 해시/파싱합니다. 버퍼는 with 블록 안에서만 사용할 수 있습니다.
+    """
+    if isinstance(pdf_source, (bytes, bytearray)):
+        yield bytes(pdf_source), f"메모리 PDF ({len(pdf_source)} bytes)"
+        return
+    with open(pdf_source, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0: # 빈 파일은 mmap할 수 없음
+            yield b"", pdf_source
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view, pdf_source
+            finally:
+                view.release() # mmap을 닫을 수 있도록 먼저 해제
+
+def compute_content_hash(pdf_source):
+    """PDF 내용(bytes 또는 파일 경로)의 MD5 해시를 계산합니다 (캐시 키로 사용)."""
+    with _open_pdf_source(pdf_source) as (pdf_buffer, _):
+        return hashlib.md5(pdf_buffer).hexdigest()
+
+def read_cache(name):
+    """캐시 폴더에서 파일 내용을 읽습니다. 없으면 None을 반환합니다."""
+    cache_path = os.path.join(CACHE_DIR, name)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def write_cache(name, content):
+    """임시 파일에 쓴 뒤 os.replace로 교체하여 캐시 파일을 원자적으로 저장합니다."""
+    cache_path = os.path.join(CACHE_DIR, name)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        # 캐시 저장 실패는 치명적이지 않으므로 경고만 출력
+        print(f"캐시 저장 실패 ({cache_path}): {e}")
+
+# 페이지 추출 워커 프로세스가 열어 둔 PDF 문서 (내용 해시 → 문서, 최근 것만 유지)
+_worker_docs = {}
+# 워커가 동시에 열어 둘 최대 문서 수 (여러 보고서를 동시에 추출하는 경우 대비)
+_WORKER_DOC_CACHE_SIZE = 4
+
+# 모든 보고서가 함께 쓰는 페이지 추출 프로세스 풀 (첫 병렬 추출 시 생성)
+_extract_pool = None
+_extract_pool_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _pdf_text_flags():
+    """PDF 텍스트 추출 플래그 (기본값 + 합자 보존 + 줄 끝 하이픈 연결)."""
+    import fitz
+    return (
+        fitz.TEXT_PRESERVE_LIGATURES
+        | fitz.TEXT_PRESERVE_WHITESPACE
+        | fitz.TEXT_MEDIABOX_CLIP
+        | fitz.TEXT_DEHYPHENATE
+    )
+
+def _get_extract_pool():
+    """공유 페이지 추출 프로세스 풀을 반환합니다 (최대 EXTRACT_MAX_WORKERS개 프로세스).
 
-def extract_text_from_pdf(pdf_path):
-    """PDF 파일에서 텍스트를 추출합니다."""
-    print(f"PDF 파일에서 텍스트 추출 중: {pdf_path}")
-    text = ""
+    asyncio.to_thread 등으로 스레드가 여러 개 떠 있는 상태에서 fork하면 교착 위험이 있으므로
+    (gRPC 등은 fork 안전하지 않음) forkserver(지원하지 않는 OS에서는 spawn)로 워커를 띄웁니다.
+    """
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is None:
+            import multiprocessing
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _extract_pool = ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, EXTRACT_MAX_WORKERS),
+                mp_context=multiprocessing.get_context(method),
+            )
+        return _extract_pool
+
+def _reset_extract_pool():
+    """워커가 비정상 종료되어 망가진 풀을 버리고 다음 추출 때 새로 만들도록 합니다."""
+    global _extract_pool
+    with _extract_pool_lock:
+        if _extract_pool is not None:
+            _extract_pool.shutdown(wait=False, cancel_futures=True)
+            _extract_pool = None
+
+def _worker_doc(content_hash, pdf_path):
+    """워커 프로세스에서 보고서별 PDF를 한 번만 열어 재사용합니다.
+
+    작업에는 파일 경로만 담기므로 PDF 내용을 작업마다 프로세스 간 전송(pickle)하지 않습니다.
+    """
+    doc = _worker_docs.pop(content_hash, None)
+    if doc is None:
+        import fitz # PyMuPDF: C 기반 PDF 라이브러리
+        doc = fitz.open(pdf_path)
+        while len(_worker_docs) >= _WORKER_DOC_CACHE_SIZE:
+            _worker_docs.pop(next(iter(_worker_docs))).close() # 가장 오래전에 쓴 문서 닫기
+    _worker_docs[content_hash] = doc # 최근 사용 순서 유지를 위해 다시 넣음
+    return doc
+
+def _page_text(doc, page_idx):
+    """한 페이지의 텍스트를 읽기 순서(위→아래, 왼쪽→오른쪽)로 추출합니다.
+
+    콘텐츠 스트림이 없는 빈 페이지는 텍스트 추출을 건너뜁니다.
+    실패 시 오류를 출력하고 빈 문자열을 반환합니다.
+    """
+    try:
+        page = doc.load_page(page_idx)
+        if not page.get_contents(): # 콘텐츠 스트림 xref 목록만 확인 (파싱 없음)
+            return ""
+        text = page.get_text("text", flags=_pdf_text_flags(), sort=True)
+        # sort=True는 세로 간격만큼 빈 줄을 넣으므로 연속된 빈 줄은 하나로 줄임
+        return _BLANK_LINES.sub("\n\n", text)
+    except Exception as page_e:
+        # 특정 페이지 추출 실패 시 오류 메시지 출력 후 계속 진행
+        print(f"{page_idx + 1}번째 페이지 텍스트 추출 중 오류: {page_e}")
+        return ""
+
+def _extract_page(content_hash, pdf_path, page_idx):
+    """워커 프로세스에서 실행: (페이지 번호, 텍스트)를 반환합니다."""
+    return page_idx, _page_text(_worker_doc(content_hash, pdf_path), page_idx)
+
+@contextmanager
+def _pdf_path_for_workers(pdf_source):
+    """워커가 열 수 있는 PDF 파일 경로를 제공합니다.
+
+    메모리로 받은 PDF(bytes)는 병렬 추출 동안만 임시 파일로 쓰고 끝나면 지웁니다.
+    """
+    if not isinstance(pdf_source, (bytes, bytearray)):
+        yield pdf_source
+        return
+    import tempfile
+    fd, tmp_path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(pdf_source)
+        yield tmp_path
+    finally:
+        os.remove(tmp_path)
+
+def _take_body_pages(page_texts):
+    """페이지 텍스트를 순서대로 받아 부록/참고문헌이 시작되기 전까지, 분량 상한까지만 모읍니다.
+
+    페이지 중간에서 자르지 않도록 상한 안에 온전히 들어가는 페이지까지만 포함합니다
+    (첫 페이지만으로 상한을 넘으면 첫 페이지를 상한까지 자릅니다).
+    """
+    parts = []
+    total_chars = 0
+    for page_idx, page_text in enumerate(page_texts):
+        if page_idx >= APPENDIX_SCAN_START_PAGE and _APPENDIX_HEADING.search(page_text):
+            print(f"{page_idx + 1}페이지에서 부록/참고문헌 시작, 이후 페이지는 제외합니다.")
+            break
+        # 두 번째 페이지부터는 "\n".join으로 붙는 구분자 한 글자도 함께 계산
+        page_chars = len(page_text) + (1 if parts else 0)
+        if total_chars + page_chars > PDF_TEXT_MAX_CHARS:
+            if not parts:
+                parts.append(page_text[:PDF_TEXT_MAX_CHARS])
+            print(f"추출 텍스트가 {PDF_TEXT_MAX_CHARS}자를 넘어 {max(page_idx, 1)}페이지까지만 사용합니다.")
+            break
+        parts.append(page_text)
+        total_chars += page_chars
+    return parts
+
+def extract_text_from_pdf(pdf_source, content_hash=None):
+    """PDF에서 텍스트를 추출합니다 (PyMuPDF 사용, 페이지 병렬 처리, 내용 해시 기준 캐시).
+
+    pdf_source는 파일 경로 또는 HTTP로 받은 PDF 원본(bytes)입니다.
+    """
     try:
-        with open(pdf_path, 'rb') as file: # 바이너리 읽기 모드
-            reader = PyPDF2.PdfReader(file)
-            num_pages = len(reader.pages)
-            print(f"총 {num_pages} 페이지")
-            for page_num in range(num_pages):
+        # 파일은 한 번만 매핑해 해시/추출에 재사용 (bytes면 디스크를 거치지 않음)
+        with _open_pdf_source(pdf_source) as (pdf_buffer, source_name):
+            if content_hash is None:
+                content_hash = hashlib.md5(pdf_buffer).hexdigest()
+            cached_text = read_cache(f"{content_hash}.txt")
+            if cached_text is not None:
+                print(f"캐시된 추출 텍스트 사용 (해시: {content_hash}, 총 {len(cached_text)}자)")
+                return cached_text
+
+            print(f"PDF에서 텍스트 추출 중: {source_name}")
+            import fitz # PyMuPDF: C 기반 PDF 라이브러리
+            with fitz.open(stream=pdf_buffer, filetype="pdf") as doc:
+                num_pages = doc.page_count
+                print(f"총 {num_pages} 페이지")
+                num_workers = min(os.cpu_count() or 1, EXTRACT_MAX_WORKERS, num_pages)
+                if num_workers <= 1:
+                    # 단일 코어 또는 1페이지 문서는 프로세스 생성 비용 없이 직접 처리
+                    # (생성기이므로 본문이 끝나면 나머지 페이지는 추출하지 않음)
+                    parts = _take_body_pages(_page_text(doc, page_idx) for page_idx in range(num_pages))
+        if num_workers > 1:
+            print(f"공유 프로세스 풀로 페이지 병렬 추출 (최대 {num_workers}개 프로세스)...")
+            executor = _get_extract_pool()
+            with _pdf_path_for_workers(pdf_source) as pdf_path:
+                futures = [executor.submit(_extract_page, content_hash, pdf_path, page_idx)
+                           for page_idx in range(num_pages)]
                 try:
-                    page = reader.pages[page_num]
-                    extracted_page_text = page.extract_text()
-                    if extracted_page_text: # None이 아닌 경우에만 추가
-                        text += extracted_page_text
-                except Exception as page_e:
-                    # 특정 페이지 추출 실패 시 오류 메시지 출력 후 계속 진행
-                    print(f"{page_num + 1}번째 페이지 텍스트 추출 중 오류: {page_e}")
-            print(f"텍스트 추출 완료 (총 {len(text)}자)")
-            return text
+                    # 페이지 순서대로 결과를 받다가 본문이 끝나면 아직 시작하지 않은 페이지 작업은 취소
+                    parts = _take_body_pages(future.result()[1] for future in futures)
+                except BrokenProcessPool:
+                    _reset_extract_pool()
+                    raise
+                finally:
+                    for future in futures:
+                        future.cancel()
+                    # 임시 파일을 지우기 전에 이미 시작된 페이지 작업이 끝나기를 기다림
+                    wait_futures(futures)
+        text = "\n".join(parts) # 페이지 순서대로 결합
+        print(f"텍스트 추출 완료 (총 {len(text)}자)")
+        write_cache(f"{content_hash}.txt", text)
+        return text
     except Exception as e:
         print(f"PDF 텍스트 추출 중 오류 발생: {e}")
         raise # 상위 호출자로 예외 전파
 
-def generate_blog_post_with_gemini(api_key, pdf_text):
-    """Gemini API를 사용하여 주어진 텍스트로 블로그 글을 생성합니다."""
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
-    if not pdf_text or pdf_text.strip() == "":
-        # PDF에서 추출된 텍스트가 비어있는 경우
-        raise ValueError("PDF에서 추출된 텍스트가 비어 있습니다. 블로그 글을 생성할 수 없습니다.")
-    print("Gemini API 설정 및 호출 시작...")
+def _is_rate_limited(exc):
+    """429 (요청 한도 초과) 오류인지 확인합니다."""
+    from google.genai import errors
+    return isinstance(exc, errors.APIError) and exc.code == 429
+
+def _retry_after_seconds(exc):
+    """429 오류에 서버가 지정한 재시도 대기 시간(RetryInfo 또는 Retry-After)이 있으면 초 단위로 반환합니다."""
+    # APIError.details는 오류 응답 JSON: {"error": {"details": [{"@type": "...RetryInfo", "retryDelay": "37s"}]}}
+    details = getattr(exc, "details", None)
+    error = details.get("error", details) if isinstance(details, dict) else {}
+    for detail in error.get("details") or []:
+        delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+        if delay:
+            try:
+                return float(str(delay).rstrip("s"))
+            except ValueError:
+                pass
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
     try:
-        genai.configure(api_key=api_key)
-        # Gemini 모델을 'gemini-2.5-pro-exp-03-25'로 변경
-        model = genai.GenerativeModel('gemini-2.5-pro-exp-03-25')
-        print(f"Gemini 모델 '{model.model_name}' 사용 중...")
+        return float(headers["Retry-After"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def _wait_gemini_retry(retry_state):
+    """서버가 알려준 대기 시간을 우선 사용하고, 없으면 지터를 더한 지수 백오프로 대기합니다."""
+    from tenacity import wait_exponential_jitter
+    delay = _retry_after_seconds(retry_state.outcome.exception())
+    return delay if delay is not None else wait_exponential_jitter(initial=2, max=60)(retry_state)
+
+def _log_gemini_retry(retry_state):
+    print(f"Gemini 요청 한도 초과 (시도 {retry_state.attempt_number}/{GEMINI_MAX_ATTEMPTS}), "
+          f"{retry_state.next_action.sleep:.1f}초 후 재시도...")
+
+def _gemini_retry_policy():
+    """Gemini 호출 재시도 정책: 429일 때만, 최대 GEMINI_MAX_ATTEMPTS회."""
+    from tenacity import retry_if_exception, stop_after_attempt
+    return dict(
+        retry=retry_if_exception(_is_rate_limited),
+        wait=_wait_gemini_retry,
+        stop=stop_after_attempt(GEMINI_MAX_ATTEMPTS),
+        before_sleep=_log_gemini_retry,
+        reraise=True,
+    )
 
-        prompt = f"""
+class _TokenRateLimiter:
+    """최근 60초 동안 보낸 토큰 수를 기록해, 분당 한도를 넘기 전에 스스로 대기합니다 (슬라이딩 윈도)."""
+
+    WINDOW = 60.0
+
+    def __init__(self, tokens_per_minute):
+        self.tokens_per_minute = tokens_per_minute
+        self._sent = deque() # (전송 시각, 토큰 수)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens):
+        """지금 보낼 수 있으면 기록하고 0을, 아니면 기다려야 할 시간(초)을 반환합니다."""
+        tokens = min(tokens, self.tokens_per_minute) # 한도보다 큰 요청은 윈도가 빌 때까지만 대기
+        with self._lock:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0][0] >= self.WINDOW:
+                self._total -= self._sent.popleft()[1]
+            excess = self._total + tokens - self.tokens_per_minute
+            if excess <= 0:
+                self._sent.append((now, tokens))
+                self._total += tokens
+                return 0.0
+            # 오래된 기록부터 윈도를 벗어나며 필요한 만큼 자리가 나는 시점까지 대기
+            for sent_at, sent_tokens in self._sent:
+                excess -= sent_tokens
+                if excess <= 0:
+                    return sent_at + self.WINDOW - now
+
+    def wait(self, tokens):
+        while (delay := self._reserve(tokens)) > 0:
+            print(f"Gemini 분당 토큰 한도 근접, {delay:.1f}초 대기...")
+            time.sleep(delay)
+
+    async def wait_async(self, tokens):
+        while (delay := self._reserve(tokens)) > 0:
+            print(f"Gemini 분당 토큰 한도 근접, {delay:.1f}초 대기...")
+            await asyncio.sleep(delay)
+
+# 프로세스 안의 모든 Gemini 호출(동기/비동기)이 공유하는 분당 토큰 제한기
+_gemini_rate_limiter = _TokenRateLimiter(GEMINI_TOKENS_PER_MINUTE)
+
+def _request_tokens(pdf_text):
+    """요청 하나가 소모할 토큰 수 추정치 (보고서 + 고정 프롬프트 + 최대 출력)."""
+    # 토큰 수는 글자 수를 넘지 않으므로 보고서와 고정 프롬프트는 글자 수로 상한을 잡음
+    return len(pdf_text) + len(_PROMPT_PREFIX) + len(_PROMPT_SUFFIX) + GEMINI_MAX_OUTPUT_TOKENS
+
+def _stream_generate_content(client, prompt, request_tokens):
+    """스트리밍 모드로 Gemini를 호출하여 (마지막 응답 조각, 전체 텍스트)를 반환합니다.
+
+    마지막 조각에 종료 이유(finish_reason)와 차단 정보(prompt_feedback)가 담깁니다.
+    호출(재시도 포함) 전마다 분당 토큰 한도를 확인하고, 429 발생 시 재시도합니다.
+    """
+    from tenacity import Retrying
+    for attempt in Retrying(**_gemini_retry_policy()):
+        with attempt:
+            _gemini_rate_limiter.wait(request_tokens)
+            # 생성이 끝날 때까지 기다리지 않고 도착하는 조각을 바로 수집
+            response = None
+            chunks = []
+            for response in client.models.generate_content_stream(
+                model=GEMINI_MODEL_NAME,
+                contents=prompt,
+                config={"max_output_tokens": GEMINI_MAX_OUTPUT_TOKENS},
+            ):
+                if response.text:
+                    chunks.append(response.text)
+    return response, "".join(chunks)
+
+async def _stream_generate_content_async(client, prompt, request_tokens):
+    """_stream_generate_content의 비동기 버전 (client.aio 사용)."""
+    from tenacity import AsyncRetrying
+    async for attempt in AsyncRetrying(**_gemini_retry_policy()):
+        with attempt:
+            await _gemini_rate_limiter.wait_async(request_tokens)
+            response = None
+            chunks = []
+            async for response in await client.aio.models.generate_content_stream(
+                model=GEMINI_MODEL_NAME,
+                contents=prompt,
+                config={"max_output_tokens": GEMINI_MAX_OUTPUT_TOKENS},
+            ):
+                if response.text:
+                    chunks.append(response.text)
+    return response, "".join(chunks)
+
+# Gemini 프롬프트의 고정 부분 (보고서 본문 앞/뒤). 본문은 별도 part로 넘겨 하나의 큰 문자열로 복사하지 않습니다.
+_PROMPT_PREFIX = """
         당신은 국회입법조사처의 보고서 내용을 일반 대중이 이해하기 쉽게 **Markdown 형식의 블로그 게시물**로 재작성하는 AI 어시스턴트입니다. 최종 목표는 GitHub Pages 블로그('Handmade Blog' 템플릿 사용)에 게시할 수 있는 `.md` 파일을 만드는 것입니다.
 
         **작성 가이드라인: POSST 구조 기반**
@@ -168,46 +1054,265 @@ def generate_blog_post_with_gemini(api_key, pdf_text):
         6.  **사례:** 보고서에서 명확히 가상이라고 언급하지 않는 한 사실로 간주. 불확실하면 가상이라고 단정하지 말 것.
 
         --- 보고서 내용 시작 ---
-        {pdf_text}
+        """
+_PROMPT_SUFFIX = """
         --- 보고서 내용 끝 ---
 
         **이제 위의 모든 가이드라인과 보고서 내용을 바탕으로, 완결된 Markdown 형식의 블로그 게시물 본문 전체를 작성해주세요.**
         """
-        # Gemini 모델의 입력 토큰 제한 고려 (필요시 pdf_text 길이 조절)
-        max_input_length = 1000000 # gemini-1.5-pro-latest는 컨텍스트 창이 매우 큼
-        if len(pdf_text) > max_input_length:
-            print(f"입력 텍스트가 너무 깁니다 ({len(pdf_text)}자). 앞부분 {max_input_length}자만 사용합니다.")
-            pdf_text_input = pdf_text[:max_input_length]
-        else:
-            pdf_text_input = pdf_text
 
-        response = model.generate_content(prompt)
+def _build_blog_prompt(pdf_text_input):
+    """POSST 구조 가이드라인과 보고서 본문으로 Gemini 프롬프트 part 목록을 만듭니다."""
+    return [_PROMPT_PREFIX, pdf_text_input, _PROMPT_SUFFIX]
+
+def _cap_pdf_text(pdf_text):
+    """Gemini에 보낼 텍스트를 PDF_TEXT_MAX_CHARS자 이내로, 가능하면 줄 단위로 자릅니다.
+
+    추출 단계에서 이미 상한을 적용하지만, 상한을 낮추기 전에 캐시된 텍스트도 같은 기준으로 맞춥니다.
+    이 상한이 Gemini 입력 토큰 한도보다 훨씬 작으므로 토큰 수를 따로 세지 않습니다.
+    """
+    if len(pdf_text) <= PDF_TEXT_MAX_CHARS:
+        return pdf_text
+    cut = pdf_text.rfind("\n", 0, PDF_TEXT_MAX_CHARS + 1)
+    if cut <= 0:
+        cut = PDF_TEXT_MAX_CHARS
+    print(f"입력 텍스트가 {len(pdf_text)}자로 길어 앞부분 {cut}자만 사용합니다.")
+    return pdf_text[:cut]
+
+def _cached_blog_post(content_hash):
+    """같은 보고서(content_hash)로 이미 생성된 블로그 글이 캐시에 있으면 반환합니다."""
+    if not content_hash:
+        return None
+    cached_post = read_cache(f"{content_hash}.md")
+    if cached_post is not None:
+        print(f"이미 생성된 블로그 글 재사용 (해시: {content_hash}), Gemini 호출 생략")
+    return cached_post
+
+def _published_post(content_hash):
+    """같은 보고서(content_hash)로 게시한 글 파일이 POSTS_DIR에 남아 있으면 그 경로를 반환합니다."""
+    filepath = read_cache(f"{content_hash}.published")
+    if filepath and os.path.isfile(filepath):
+        print(f"이미 게시된 보고서입니다 (해시: {content_hash}): {filepath}, 저장 생략")
+        return filepath
+    return None
+
+def _check_gemini_inputs(api_key, pdf_text):
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
+    if not pdf_text or pdf_text.strip() == "":
+        # PDF에서 추출된 텍스트가 비어있는 경우
+        raise ValueError("PDF에서 추출된 텍스트가 비어 있습니다. 블로그 글을 생성할 수 없습니다.")
+
+def _finish_reason(response):
+    """응답 첫 번째 후보의 종료 이유 이름(예: 'STOP', 'MAX_TOKENS')을 반환합니다. 없으면 None."""
+    candidates = getattr(response, 'candidates', None)
+    if not candidates or candidates[0].finish_reason is None:
+        return None
+    reason = candidates[0].finish_reason
+    return getattr(reason, 'name', str(reason))
+
+def _finish_blog_post(response, blog_post, content_hash):
+    """Gemini 응답 텍스트를 검사/정리하고 캐시에 저장한 뒤 반환합니다.
+
+    출력 토큰 상한에서 잘린 응답은 캐시/게시하지 않도록 ValueError를 발생시킵니다
+    (잘린 글이 캐시되면 같은 보고서에 대해 다시 생성되지 않음).
+    """
+    if _finish_reason(response) == 'MAX_TOKENS':
+        print(f"Gemini 응답이 출력 토큰 상한({GEMINI_MAX_OUTPUT_TOKENS})에서 잘렸습니다.")
+        raise ValueError(f"Gemini 응답이 출력 토큰 상한({GEMINI_MAX_OUTPUT_TOKENS})에서 잘림")
+    # 응답 텍스트 유효성 검사
+    if blog_post.strip():
+        # 응답 시작/끝에 불필요한 마크다운 코드 블록 마커 제거
+        blog_post = _MD_FENCE_OPEN.sub('', blog_post)
+        blog_post = _MD_FENCE_CLOSE.sub('', blog_post)
+        blog_post = blog_post.strip()
+        if content_hash:
+            write_cache(f"{content_hash}.md", blog_post)
+        return blog_post
+    elif getattr(response, 'prompt_feedback', None) and response.prompt_feedback.block_reason:
+        # API에서 콘텐츠 생성을 차단한 경우
+        reason = response.prompt_feedback.block_reason
+        print(f"콘텐츠 생성 차단됨. 이유: {reason}")
+        raise ValueError(f"Gemini 콘텐츠 생성 차단됨: {reason}")
+    else:
+        # 예상치 못한 응답 형식
+        print("오류: Gemini API 응답에서 유효한 텍스트를 추출할 수 없습니다.")
+        # print("전체 응답:", response) # 디버깅 시 전체 응답 내용 확인
+        raise ValueError("Gemini API 응답 형식 오류")
+
+def generate_blog_post_with_gemini(api_key, pdf_text, content_hash=None):
+    """Gemini API를 사용하여 주어진 텍스트로 블로그 글을 생성합니다.
+
+    content_hash가 주어지면 같은 보고서에 대해 이미 생성된 글을 재사용합니다.
+    """
+    cached_post = _cached_blog_post(content_hash)
+    if cached_post is not None:
+        return cached_post
+    _check_gemini_inputs(api_key, pdf_text)
+    pdf_text = _cap_pdf_text(pdf_text)
+    print("Gemini API 설정 및 호출 시작...")
+    from google import genai # Gemini API 라이브러리 (google-genai SDK)
+    try:
+        client = genai.Client(api_key=api_key)
+        print(f"Gemini 모델 '{GEMINI_MODEL_NAME}' 사용 중...")
+        prompt = _build_blog_prompt(pdf_text)
+
+        response, blog_post = _stream_generate_content(client, prompt, _request_tokens(pdf_text))
         print("Gemini API 응답 수신 완료.")
+        return _finish_blog_post(response, blog_post, content_hash)
 
-        # 응답 객체에서 텍스트 추출 및 유효성 검사
-        if hasattr(response, 'text'):
-            blog_post = response.text
-            # 응답 시작/끝에 불필요한 마크다운 코드 블록 마커 제거
-            blog_post = re.sub(r'^```markdown\s*', '', blog_post, flags=re.IGNORECASE)
-            blog_post = re.sub(r'\s*```$', '', blog_post)
-            return blog_post.strip()
-        elif hasattr(response, 'prompt_feedback') and response.prompt_feedback.block_reason:
-            # API에서 콘텐츠 생성을 차단한 경우
-            reason = response.prompt_feedback.block_reason
-            print(f"콘텐츠 생성 차단됨. 이유: {reason}")
-            raise ValueError(f"Gemini 콘텐츠 생성 차단됨: {reason}")
-        else:
-            # 예상치 못한 응답 형식
-            print("오류: Gemini API 응답에서 유효한 텍스트를 추출할 수 없습니다.")
-            # print("전체 응답:", response) # 디버깅 시 전체 응답 내용 확인
-            raise ValueError("Gemini API 응답 형식 오류")
+    except Exception as e:
+        print(f"Gemini API 호출 중 오류 발생: {e}")
+        raise
+
+async def generate_blog_post_with_gemini_async(api_key, pdf_text, content_hash=None):
+    """generate_blog_post_with_gemini의 비동기 버전 (Gemini 비동기 클라이언트 사용)."""
+    cached_post = _cached_blog_post(content_hash)
+    if cached_post is not None:
+        return cached_post
+    _check_gemini_inputs(api_key, pdf_text)
+    pdf_text = _cap_pdf_text(pdf_text)
+    print("Gemini API 설정 및 비동기 호출 시작...")
+    from google import genai # Gemini API 라이브러리 (google-genai SDK)
+    try:
+        client = genai.Client(api_key=api_key)
+        prompt = _build_blog_prompt(pdf_text)
+
+        response, blog_post = await _stream_generate_content_async(client, prompt, _request_tokens(pdf_text))
+        print("Gemini API 응답 수신 완료.")
+        return _finish_blog_post(response, blog_post, content_hash)
 
     except Exception as e:
         print(f"Gemini API 호출 중 오류 발생: {e}")
         raise
 
-def save_markdown_post(markdown_content):
-    """생성된 마크다운 내용을 Front Matter와 함께 파일로 저장합니다."""
+class _BatchTimeout(Exception):
+    """Gemini 배치 작업이 GEMINI_BATCH_TIMEOUT 안에 끝나지 않음."""
+
+def _generate_posts_sync(api_key, pdf_texts, content_hashes, posts, indices):
+    """indices의 보고서들을 하나씩 동기 호출로 생성하여 posts에 글 또는 예외를 채웁니다."""
+    for idx in indices:
+        try:
+            posts[idx] = generate_blog_post_with_gemini(api_key, pdf_texts[idx], content_hashes[idx])
+        except Exception as e:
+            posts[idx] = e
+
+def _run_batch_job(client, batch_requests):
+    """배치 작업을 만들고 끝날 때까지 기다려 요청 순서대로 응답 목록을 반환합니다.
+
+    GEMINI_BATCH_TIMEOUT 안에 끝나지 않으면 작업을 취소하고 _BatchTimeout을 발생시키며,
+    작업이 실패/취소/만료로 끝나면 ValueError를 발생시킵니다.
+    """
+    print(f"Gemini Batch API 작업 생성 ({len(batch_requests)}건)...")
+    job = client.batches.create(
+        model=GEMINI_MODEL_NAME,
+        src=batch_requests,
+        config={"display_name": f"nars-blog-{datetime.now().strftime('%Y%m%d-%H%M%S')}"},
+    )
+    deadline = time.monotonic() + GEMINI_BATCH_TIMEOUT
+    while job.state.name not in GEMINI_BATCH_DONE_STATES:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            try:
+                client.batches.cancel(name=job.name)
+            except Exception as e:
+                print(f"배치 작업 {job.name} 취소 실패: {e}")
+            raise _BatchTimeout(f"배치 작업 {job.name}이 {GEMINI_BATCH_TIMEOUT}초 안에 끝나지 않아 취소했습니다.")
+        print(f"배치 작업 {job.name} 상태: {job.state.name}, {GEMINI_BATCH_POLL_INTERVAL}초 후 재확인...")
+        time.sleep(min(GEMINI_BATCH_POLL_INTERVAL, remaining))
+        job = client.batches.get(name=job.name)
+    print(f"배치 작업 {job.name} 종료: {job.state.name}")
+    if job.state.name not in ("JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED"):
+        raise ValueError(f"Gemini 배치 작업 실패: {job.state.name} {job.error or ''}")
+    return list(job.dest.inlined_responses or [])
+
+def generate_blog_posts_batch(api_key, pdf_texts, content_hashes=None):
+    """여러 보고서의 블로그 글을 Gemini Batch API 요청 한 번으로 생성합니다.
+
+    요청별 HTTP 왕복과 분당 요청 한도 소모를 줄이고 배치 요금(50% 할인)을 적용받습니다.
+    이미 생성된 글(캐시)은 제외하고, 생성할 글이 하나뿐이거나 배치 작업이 제한 시간 안에
+    끝나지 않으면 동기 호출을 사용합니다.
+    결과 목록에는 보고서 순서대로 블로그 글 또는 실패한 보고서의 예외가 담깁니다.
+    """
+    content_hashes = list(content_hashes or [None] * len(pdf_texts))
+    posts = [_cached_blog_post(content_hash) for content_hash in content_hashes]
+    pending = [idx for idx, post in enumerate(posts) if post is None]
+    if len(pending) == 1:
+        _generate_posts_sync(api_key, pdf_texts, content_hashes, posts, pending)
+        return posts
+    if not pending:
+        return posts
+
+    for idx in list(pending):
+        try:
+            _check_gemini_inputs(api_key, pdf_texts[idx])
+        except ValueError as e:
+            posts[idx] = e
+            pending.remove(idx)
+    if not pending:
+        return posts
+
+    from google import genai # Gemini API 라이브러리 (google-genai SDK)
+    client = genai.Client(api_key=api_key)
+    batch_requests = []
+    for idx in pending:
+        pdf_text = _cap_pdf_text(pdf_texts[idx])
+        batch_requests.append({
+            "contents": [{"role": "user", "parts": [{"text": part} for part in _build_blog_prompt(pdf_text)]}],
+            "config": {"max_output_tokens": GEMINI_MAX_OUTPUT_TOKENS},
+        })
+
+    try:
+        inlined_responses = _run_batch_job(client, batch_requests)
+    except _BatchTimeout as e:
+        print(f"{e} 보고서별 동기 호출로 대체합니다.")
+        _generate_posts_sync(api_key, pdf_texts, content_hashes, posts, pending)
+        return posts
+    except Exception as e:
+        # 작업 생성/조회 오류나 작업 실패는 해당 배치의 모든 보고서 실패로 기록
+        print(f"Gemini 배치 작업 오류: {e}")
+        for idx in pending:
+            posts[idx] = e
+        return posts
+
+    for idx, inlined in zip(pending, inlined_responses):
+        if inlined.error:
+            posts[idx] = ValueError(f"Gemini 배치 요청 실패: {inlined.error}")
+            continue
+        try:
+            posts[idx] = _finish_blog_post(inlined.response, inlined.response.text or "", content_hashes[idx])
+        except ValueError as e:
+            posts[idx] = e
+    for idx in pending[len(inlined_responses):]:
+        posts[idx] = ValueError("Gemini 배치 응답에 이 보고서의 결과가 없습니다.")
+    return posts
+
+def slugify(title):
+    """제목을 파일명용 슬러그로 바꿉니다 (한 번의 순회로 처리).
+
+    문자/숫자/밑줄(한글 포함)과 하이픈만 남기고, 공백과 하이픈이 이어진 구간은
+    하이픈 하나로 합치며, 앞뒤 하이픈은 제거합니다.
+    """
+    out = []
+    prev = '-' # 앞쪽 하이픈이 생기지 않도록 하이픈으로 시작
+    for ch in title.lower():
+        if ch.isspace() or ch == '-':
+            ch = '-'
+            if prev == '-':
+                continue
+        elif not (ch.isalnum() or ch == '_'):
+            continue # 영문/숫자/한글/밑줄 외 문자 제거 (정규식 \w 와 같은 기준)
+        out.append(ch)
+        prev = ch
+    if out and out[-1] == '-':
+        out.pop()
+    return "".join(out)
+
+def save_markdown_post(markdown_content, content_hash=None):
+    """생성된 마크다운 내용을 Front Matter와 함께 파일로 저장합니다.
+
+    content_hash가 주어지면 게시한 파일 경로를 캐시에 기록하여, 같은 보고서를 다시 게시하지 않게 합니다.
+    """
     try:
         print("생성된 내용을 블로그 포스트 파일로 저장 시도...")
 
@@ -225,9 +1330,7 @@ def save_markdown_post(markdown_content):
 
         # 파일명용 슬러그 생성 (한글 허용 및 개선)
         slug_base_title = title_line.lstrip('# ').strip() # 슬러그 생성용 원본 제목
-        slug = re.sub(r'[^\w\s\-가-힣]+', '', slug_base_title.lower()) # 영문/숫자/공백/하이픈/한글 외 제거
-        slug = re.sub(r'\s+', '-', slug).strip('-') # 공백을 하이픈으로 변경
-        slug = re.sub(r'--+', '-', slug) # 연속된 하이픈을 하나로 변경
+        slug = slugify(slug_base_title)
         if not slug: slug = "report" # 슬러그가 비어있을 경우 기본값 사용
         print(f"생성된 슬러그: {slug}")
 
@@ -235,4 +1338,121 @@ def save_markdown_post(markdown_content):
         kst = timezone(timedelta(hours=9))
         now = datetime.now(kst)
 
-        # --- ID 
+        # --- ID 및 게시 날짜 생성 (기존 포스트 형식: id YYYYMMDD, date YYYY.MM.DD) ---
+        post_id = now.strftime("%Y%m%d") # 예: 20250422
+        post_date = now.strftime("%Y.%m.%d") # 예: 2025.04.22
+
+        # --- Front Matter 생성 ---
+        front_matter = (
+            "---\n"
+            f"id: {post_id}\n"
+            f'title: "{post_title_for_frontmatter}"\n'
+            'subtitle: ""\n'
+            f'date: "{post_date}"\n'
+            'tags: ""\n'
+            "---\n\n"
+        )
+
+        # --- 파일 저장 ---
+        os.makedirs(POSTS_DIR, exist_ok=True)
+        filename = f"{now.strftime('%Y-%m-%d')}-{slug}.md"
+        filepath = os.path.join(POSTS_DIR, filename)
+        # Front Matter와 본문을 한 번에 기록
+        with open(filepath, "w", encoding="utf-8", buffering=1 << 16) as f:
+            f.write(front_matter + cleaned_output + "\n")
+        print(f"블로그 포스트 저장 완료: {filepath}")
+        if content_hash:
+            write_cache(f"{content_hash}.published", filepath)
+        return filepath
+
+    except Exception as e:
+        print(f"마크다운 파일 저장 중 오류 발생: {e}")
+        raise
+
+def submit_markdown_post(markdown_content, content_hash=None):
+    """save_markdown_post를 백그라운드 디스크 작업 스레드에서 실행하고 Future를 바로 반환합니다.
+
+    호출자는 파일 쓰기를 기다리지 않고 다음 작업을 진행한 뒤, 필요할 때 future.result()로
+    저장 경로(또는 저장 중 발생한 예외)를 받습니다.
+    """
+    return _io_executor.submit(save_markdown_post, markdown_content, content_hash)
+
+async def process_report_async(pdf_source, api_key=GEMINI_API_KEY):
+    """PDF 하나(bytes 또는 경로)를 텍스트 추출 → 블로그 글 생성 → 저장 순으로 처리하고 저장된 파일 경로를 반환합니다.
+
+    CPU/디스크 작업은 스레드로 넘기고 Gemini 호출은 비동기로 기다리므로,
+    여러 보고서를 동시에 처리하면 한 보고서의 추출이 다른 보고서의 Gemini 응답 대기와 겹칩니다.
+    """
+    if isinstance(pdf_source, Exception):
+        raise pdf_source # 다운로드 단계에서 실패한 보고서
+    content_hash = await asyncio.to_thread(compute_content_hash, pdf_source)
+    published = _published_post(content_hash)
+    if published:
+        return published
+    pdf_text = await asyncio.to_thread(extract_text_from_pdf, pdf_source, content_hash)
+    blog_post = await generate_blog_post_with_gemini_async(api_key, pdf_text, content_hash)
+    return await asyncio.wrap_future(submit_markdown_post(blog_post, content_hash))
+
+async def process_reports_async(pdf_sources, api_key=GEMINI_API_KEY):
+    """여러 PDF를 동시에 처리합니다. 결과 목록에는 저장 경로 또는 실패한 보고서의 예외가 담깁니다."""
+    return await asyncio.gather(
+        *(process_report_async(pdf_source, api_key) for pdf_source in pdf_sources),
+        return_exceptions=True, # 한 보고서 실패가 나머지 처리를 취소하지 않도록 함
+    )
+
+def process_reports_batch(pdf_sources, api_key=GEMINI_API_KEY):
+    """여러 PDF의 블로그 글을 Gemini Batch API로 한 번에 생성하여 저장합니다.
+
+    결과 목록에는 저장 경로 또는 실패한 보고서의 예외가 담깁니다.
+    """
+    # 다운로드 단계에서 실패한 보고서(예외)는 그대로 결과로 남김
+    content_hashes = [None if isinstance(pdf_source, Exception) else compute_content_hash(pdf_source)
+                      for pdf_source in pdf_sources]
+    # 이미 게시된 보고서는 추출/생성/저장을 모두 건너뜀
+    results = [pdf_source if content_hash is None else _published_post(content_hash)
+               for pdf_source, content_hash in zip(pdf_sources, content_hashes)]
+    todo = [idx for idx, result in enumerate(results) if result is None]
+    pdf_texts = [extract_text_from_pdf(pdf_sources[idx], content_hashes[idx]) for idx in todo]
+    posts = generate_blog_posts_batch(api_key, pdf_texts, [content_hashes[idx] for idx in todo])
+    # 글 저장은 백그라운드로 넘기고, 모든 저장을 요청한 뒤에 결과를 모음
+    pending = [(idx, post if isinstance(post, Exception) else submit_markdown_post(post, content_hashes[idx]))
+               for idx, post in zip(todo, posts)]
+    for idx, item in pending:
+        if isinstance(item, Exception):
+            results[idx] = item
+            continue
+        try:
+            results[idx] = item.result()
+        except Exception as e:
+            results[idx] = e
+    return results
+
+def run_pipeline(list_urls=(URL,), download_dir=DOWNLOAD_DIR, api_key=GEMINI_API_KEY, batch=False):
+    """목록 페이지들에서 최신 보고서를 내려받아 블로그 글을 생성/저장합니다.
+
+    기본은 비동기 파이프라인이며, batch=True이면 Gemini Batch API로 한 번에 생성합니다
+    (응답은 늦지만 요청 한도/요금 부담이 적음).
+    """
+    list_urls = list(list_urls)
+    if len(list_urls) == 1:
+        # 보고서가 하나면 브라우저 풀 대신 공유 드라이버를 쓰는 단일 다운로드 경로 사용
+        pdf_sources = [download_latest_report(list_urls[0], download_dir)]
+    else:
+        pdf_sources = download_latest_reports(list_urls, download_dir)
+    if batch:
+        results = process_reports_batch(pdf_sources, api_key)
+    else:
+        results = asyncio.run(process_reports_async(pdf_sources, api_key))
+    for list_url, result in zip(list_urls, results):
+        if isinstance(result, Exception):
+            print(f"보고서 처리 실패 ({list_url}): {result}")
+            traceback.print_exception(result)
+        else:
+            print(f"보고서 처리 완료 ({list_url}) → {result}")
+    return results
+
+if __name__ == "__main__":
+    # 프로세스 풀 워커(spawn/forkserver)가 모듈을 다시 import할 때는 실행되지 않음
+    results = run_pipeline()
+    if any(isinstance(result, Exception) for result in results):
+        raise SystemExit(1) # 워크플로우에서 실패로 표시되도록 종료 코드 1
@@ -0,0 +1,103 @@
+# tests/test_law.py
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import law
+
+
+def test_take_body_pages_counts_join_separators():
+    # 40,000자 두 페이지는 구분자("\n")까지 합치면 상한을 1자 넘으므로 첫 페이지만 포함
+    pages = ["a" * 40000, "b" * 40000]
+    parts = law._take_body_pages(pages)
+    assert parts == [pages[0]]
+
+    text = "\n".join(parts)
+    assert len(text) <= law.PDF_TEXT_MAX_CHARS
+    assert law._cap_pdf_text(text) == text
+
+
+def test_take_body_pages_keeps_pages_that_fit_exactly():
+    pages = ["a" * 39999, "b" * 40000]
+    text = "\n".join(law._take_body_pages(pages))
+    assert len(text) == law.PDF_TEXT_MAX_CHARS
+    assert law._cap_pdf_text(text) == text
+
+
+def _old_slug(title):
+    # slugify 도입 전 save_markdown_post의 정규식 3단계
+    import re
+    slug = re.sub(r'[^\w\s\-가-힣]+', '', title.lower())
+    slug = re.sub(r'\s+', '-', slug).strip('-')
+    return re.sub(r'--+', '-', slug)
+
+
+def test_slugify_matches_old_regex_chain():
+    titles = [
+        "국회입법조사처 보고서: AI 규제, 어디까지 왔나?",
+        "  앞뒤 공백과\t탭\n줄바꿈  ",
+        "- 하이픈 -- 연속 --- 제목 -",
+        "Mixed CASE & Symbols!! (2025)",
+        "under_score 와 숫자 123",
+        "「인용」 “따옴표” …",
+        "!!!",
+        "",
+    ]
+    for title in titles:
+        assert law.slugify(title) == _old_slug(title), title
+
+
+def test_take_body_pages_stops_at_appendix_heading():
+    pages = ["표지", "요약", "본문 1", "본문 2", "참고문헌\n1. 어떤 문헌", "부록 내용"]
+    assert law._take_body_pages(pages) == pages[:4]
+
+
+def test_take_body_pages_ignores_appendix_in_table_of_contents():
+    # APPENDIX_SCAN_START_PAGE 이전 페이지(목차)의 '부록' 줄은 부록 시작으로 보지 않음
+    toc = "목차\n1. 서론\n2. 본론\n부록\n"
+    pages = [toc] + ["본문"] * (law.APPENDIX_SCAN_START_PAGE - 1) + ["본문 계속", "  부록  \n표 1"]
+    assert law._take_body_pages(pages) == pages[:-1]
+
+
+def test_take_body_pages_needs_heading_on_its_own_line():
+    pages = ["표지", "요약", "목차", "본문에서 부록을 언급하는 문장", "References"]
+    assert law._take_body_pages(pages) == pages[:4]
+
+
+def test_find_completed_pdf_waits_for_crdownload(tmp_path):
+    old = tmp_path / "old.pdf"
+    old.write_bytes(b"%PDF-old")
+    os.utime(old, (1, 1))
+    new = tmp_path / "new.pdf"
+    new.write_bytes(b"%PDF-new")
+    (tmp_path / "next.pdf.crdownload").write_bytes(b"")
+    assert law._find_completed_pdf(str(tmp_path)) is None
+
+    (tmp_path / "next.pdf.crdownload").unlink()
+    path, size, _ = law._find_completed_pdf(str(tmp_path))
+    assert path == str(new) and size == len(b"%PDF-new")
+
+
+def test_poll_for_download_complete_returns_stable_pdf(tmp_path, monkeypatch):
+    monkeypatch.setattr(law, "DOWNLOAD_POLL_INTERVAL", 0.01)
+    pdf = tmp_path / "report.pdf"
+    pdf.write_bytes(b"%PDF-1.7 test")
+    assert law._poll_for_download_complete(str(tmp_path), timeout=5) == str(pdf)
+
+
+def test_poll_for_download_complete_times_out_on_empty_or_partial_pdf(tmp_path, monkeypatch):
+    from selenium.common.exceptions import TimeoutException
+
+    monkeypatch.setattr(law, "DOWNLOAD_POLL_INTERVAL", 0.01)
+    (tmp_path / "placeholder.pdf").write_bytes(b"") # Chrome의 0바이트 자리표시 파일
+    with pytest.raises(TimeoutException):
+        law._poll_for_download_complete(str(tmp_path), timeout=0.2)
+
+    (tmp_path / "placeholder.pdf").write_bytes(b"%PDF-1.7")
+    (tmp_path / "placeholder.pdf.crdownload").write_bytes(b"%PDF")
+    with pytest.raises(TimeoutException):
+        law._poll_for_download_complete(str(tmp_path), timeout=0.2)